@@ -0,0 +1,321 @@
+"""Command line entry points.
+
+These are kept out of the package ``__init__`` so that importing
+``clock`` (or ``clock.models``) does not pull in matplotlib.
+"""
+
+import argparse
+import functools
+from typing import Any, Optional, Tuple
+
+from matplotlib import animation, cm, pyplot as plt
+from matplotlib.axes import Axes
+# This import registers the 3D projection, but is otherwise unused.
+from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 unused import
+import numpy as np
+
+from . import drawing, models
+
+
+@functools.lru_cache(maxsize=None)
+def save_to_file() -> Optional[str]:
+    """Detect whether -o filename has been supplied.
+
+    If the command line option -o filename was supplied
+    when the script was invoked, this returns filename
+    as a string. Otherwise returns None.
+
+    The command line is only parsed on the first call
+    (rather than at import, so that importing the package
+    does not consume sys.argv); later calls reuse the result.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-o', '--output')
+
+    args = parser.parse_args()
+    return args.output
+
+
+def video_writer() -> animation.FFMpegWriter:
+    """Writer used to save animations when -o is supplied.
+
+    Frames are compressed with H.264 rather than written as raw
+    video, which cuts the size of the output by orders of magnitude.
+    The ``ultrafast`` preset with ``-threads 0`` lets ffmpeg encode
+    on all cores while matplotlib is rendering the next frame.
+    ``yuv420p`` keeps the output playable in common video players.
+    """
+    return animation.FFMpegWriter(fps=30,
+                                  codec='h264',
+                                  extra_args=[
+                                      '-preset', 'ultrafast', '-threads',
+                                      '0', '-pix_fmt', 'yuv420p'
+                                  ])
+
+
+@functools.lru_cache(maxsize=8)
+def _escapement_grid(
+        lim: float = 1.0,
+        n: int = 500) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate the escapement force over a square grid of states.
+
+    The grid covers ``-lim`` to ``lim`` in both $p$ and $\\dot{p}$
+    with ``n`` points along each side. The result is cached, so the
+    plotting functions can share it rather than each evaluating
+    the force again. The arrays are read only for this reason.
+
+    The grid is only used for plotting, where colormaps resolve far
+    less than single precision, so it is evaluated in float32 to halve
+    the memory traffic.
+
+    Returns:
+
+        Tuple of ``(p, dotp, escapement)`` arrays, each of shape (n, n).
+    """
+    p = np.linspace(-lim, lim, n, dtype=np.float32)
+    dotp = np.linspace(-lim, lim, n, dtype=np.float32)
+    p, dotp = np.meshgrid(p, dotp)
+    escapement = models.PendulumWithEscapement.escapement(p, dotp)
+    for a in (p, dotp, escapement):
+        a.setflags(write=False)
+    return p, dotp, escapement
+
+
+class PendulumAnimation:
+    """Animation consisting of a trajectory and a pendulum drawing.
+
+    Use the solution of a model to animate a plot showing the
+    pendulum trajectory in state space, and a representation of
+    the pendulum swinging.
+
+    The drawing will be added to two existing matplotlib.axes.Axes
+    objects (``state`` and ``illustration``).
+
+    Args:
+        sol: solution of the model (as returned by its ``solve``)
+        state: axes to draw the state space trajectory
+        illustration: axes to draw the illustration of the pendulum
+        color: color to use for this drawing
+        zorder: use this for all objects created
+    """
+    def __init__(self, sol: Any, state: Axes, illustration: Axes, color: str,
+                 zorder: int):
+        self.sol = sol
+        self.trajectory = drawing.Trajectory(state,
+                                             self.sol,
+                                             color=color,
+                                             zorder=zorder,
+                                             radius=0.05,
+                                             n=self.sol.t.shape[0])
+        self.pendulum = drawing.Pendulum(illustration, color, zorder)
+        self.frame = 0
+
+    def update(self):
+        """Move the animation to the next frame.
+
+        The next state is take from the IVP solution, restarting
+        from the beginning when we get to the end.
+
+        Returns:
+
+            The artists that were changed, so that only these
+            need to be redrawn when blitting.
+        """
+        state = self.trajectory.positions[self.frame]
+        self.frame = (self.frame + 1) % len(self.trajectory)
+        self.trajectory.set_marker(state)
+        self.pendulum.angle = state[0]
+        return self.trajectory.artists + self.pendulum.artists
+
+
+def pendulum():
+    """Draw an illustration of the dynamics of a draggy pendulum."""
+    bgcolor = "white"
+    fig, (state, illustration) = plt.subplots(ncols=2)
+    fig.tight_layout(pad=0)
+    fig.set_size_inches(6, 3)
+    fig.set_facecolor(bgcolor)
+
+    animations = []
+
+    configs = ((0.1, 12 * np.pi, '#f086dc'), (0.0, 2 * np.pi, '#5cad69'))
+
+    # Solve everything before creating any of the drawings
+    solutions = [
+        models.Pendulum(drag).solve([0.0, 1.0], t, 15)
+        for drag, t, _ in configs
+    ]
+
+    for i, (sol, (_, _, color)) in enumerate(zip(solutions, configs)):
+        p = PendulumAnimation(sol=sol,
+                              color=color,
+                              state=state,
+                              illustration=illustration,
+                              zorder=i)
+        animations.append(p)
+
+    def update(t: float):
+        artists = []
+        for a in animations:
+            artists.extend(a.update())
+        return artists
+
+    ani = animation.FuncAnimation(fig,
+                                  update,
+                                  animations[0].sol.t,
+                                  interval=20,
+                                  blit=True)
+
+    save_file = save_to_file()
+    if save_file:
+        ani.save_count = (animations[0].sol.t.shape[0])
+        ani.save(save_file,
+                 writer=video_writer(),
+                 dpi=150,
+                 savefig_kwargs=dict(facecolor=bgcolor))
+    plt.show()
+
+
+def escapement():
+    """Draw trajectories from pendulum with escapement."""
+    bgcolor = "white"
+    fig, (state, illustration) = plt.subplots(ncols=2)
+    fig.tight_layout(pad=0)
+    fig.set_size_inches(6, 3)
+    fig.set_facecolor(bgcolor)
+
+    animations = []
+    model = models.PendulumWithEscapement(0.1, 0.25)
+
+    lim = 1.0
+
+    # Plot the escapement force on the state axes, so that
+    # it will be overlaid on the trajectory to show where the
+    # escapement takes effect
+    _, _, escapement = _escapement_grid(lim, 500)
+    state.matshow(escapement,
+                  origin='lower',
+                  cmap=cm.bwr,
+                  extent=(-lim, lim, -lim, lim),
+                  alpha=0.8)
+
+    configs = ((.4, '#f086dc'), (.8, '#5cad69'))
+
+    # Solve everything (in one go, as all the configs share the
+    # same model) before creating any of the drawings
+    ensemble = model.solve_ensemble([[init, 0.] for init, _ in configs],
+                                    24 * np.pi, 15)
+    solutions = [models.Solution(ensemble.t, y) for y in ensemble.y]
+
+    for i, (sol, (_, color)) in enumerate(zip(solutions, configs)):
+        p = PendulumAnimation(sol=sol,
+                              state=state,
+                              illustration=illustration,
+                              color=color,
+                              zorder=i + 10)
+        animations.append(p)
+
+    def update(t: float):
+        artists = []
+        for a in animations:
+            artists.extend(a.update())
+        return artists
+
+    ani = animation.FuncAnimation(fig,
+                                  update,
+                                  animations[0].sol.t,
+                                  interval=20,
+                                  blit=True)
+
+    save_file = save_to_file()
+    if save_file:
+        ani.save_count = (animations[0].sol.t.shape[0])
+        ani.save(save_file,
+                 writer=video_writer(),
+                 dpi=150,
+                 savefig_kwargs=dict(facecolor=bgcolor))
+    plt.show()
+
+
+def escapement_surface():
+    """Plot the escapement force.
+
+    As a surface and as a heat map.
+    """
+
+    bgcolor = "white"
+    fig = plt.figure()
+    fig.set_size_inches(6, 4)
+    fig.set_facecolor(bgcolor)
+    fig.subplots_adjust(bottom=0.2)
+    contour = fig.add_subplot(1, 2, 1)
+    surface = fig.add_subplot(1, 2, 2, projection='3d')
+
+    # Make data.
+    lim = 1.0
+    p, dotp, escapement = _escapement_grid(lim, 500)
+
+    # Plot the surface. The full resolution grid is far more than
+    # can be seen in the 3D view, so use a coarser grid here (the
+    # heat map below still uses the full grid). The color scale is
+    # fixed to the range of the full grid so that both match.
+    coarse_p, coarse_dotp, coarse_escapement = _escapement_grid(lim, 100)
+    s = surface.plot_surface(coarse_p,
+                             coarse_dotp,
+                             coarse_escapement,
+                             linewidth=1,
+                             cmap=cm.bwr,
+                             vmin=escapement.min(),
+                             vmax=escapement.max(),
+                             antialiased=True)
+    surface.plot_wireframe(coarse_p,
+                           coarse_dotp,
+                           coarse_escapement,
+                           rstride=5,
+                           cstride=5,
+                           linewidth=0.2,
+                           cmap=cm.bwr,
+                           antialiased=True)
+    surface.grid(False)
+    for axis in (surface.xaxis, surface.yaxis, surface.zaxis):
+        axis.set_pane_color((1, 1, 1))
+
+    surface.set_xlabel(r'$p$', fontsize='x-large')
+    surface.set_ylabel(r'$\dot{p}$', fontsize='x-large')
+    surface.set_zlabel(r'$e$', fontsize='x-large')
+    surface.tick_params(labelsize='x-large')
+    surface.set_xticks([-1, 1])
+    surface.set_yticks([-1, 1])
+    surface.set_zticks([-1, 1])
+
+    # Plot 2d representation
+    contour.matshow(escapement,
+                    origin='lower',
+                    cmap=cm.bwr,
+                    extent=(-lim, lim, -lim, lim))
+
+    contour.set_xlabel(r'$p$', fontsize='x-large')
+    contour.set_ylabel(r'$\dot{p}$', fontsize='x-large')
+    contour.tick_params(labeltop=False,
+                        top=False,
+                        labelbottom=True,
+                        bottom=True,
+                        labelsize='x-large')
+    contour.set_xticks([-1, 1])
+    contour.set_yticks([-1, 1])
+
+    cbar = fig.colorbar(s,
+                        label=r'$e$',
+                        ax=(surface, contour),
+                        anchor=(0.5, -0.5),
+                        aspect=40,
+                        ticks=np.linspace(escapement.min(), escapement.max(),
+                                          5),
+                        orientation='horizontal')
+    cbar.ax.tick_params(labelsize='x-large')
+    cbar.ax.set_xlabel(r'$e$', fontsize='x-large')
+
+    save_file = save_to_file()
+    if save_file:
+        plt.savefig(save_file, dpi=150)
+    plt.show()
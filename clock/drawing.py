@@ -1,3 +1,4 @@
+import math
 from typing import Any, Union, Iterable, Text
 
 from matplotlib.lines import Line2D
@@ -57,6 +58,11 @@ class Pendulum(EqualAspectAxis):
         self.ax.add_line(self._bar)
         self.ax.add_patch(self._weight)
 
+    @property
+    def artists(self):
+        """Artists that move when the angle is changed."""
+        return [self._bar, self._weight]
+
     @property
     def angle(self):
         """Angle of the pendulum."""
@@ -66,13 +72,13 @@ class Pendulum(EqualAspectAxis):
     def angle(self, value):
         """Set the pendulum angle."""
         self._angle = value
-        vector = np.array([[0, 0], [np.sin(self._angle),
-                                    -np.cos(self._angle)]])
-        vector *= 1.5
-        vector[:, 1] += 0.5
-        self._bar.set_xdata(vector[:, 0])
-        self._bar.set_ydata(vector[:, 1])
-        self._weight.set_center(vector[1, :])
+        # Position of the weight: the bar has length 1.5 and
+        # hangs from (0, 0.5). This is called every animation
+        # frame, so use scalar math rather than small arrays.
+        x = 1.5 * math.sin(value)
+        y = 0.5 - 1.5 * math.cos(value)
+        self._bar.set_data((0.0, x), (0.5, y))
+        self._weight.set_center((x, y))
 
 
 def add_state_space_arrows(ax: matplotlib.axes.Axes):
@@ -134,10 +140,10 @@ class Trajectory(EqualAspectAxis):
         ...     example_model, (start, end), init, t_eval=t_eval)
         >>> fig, ax = plt.subplots()
         >>> trajectory = Trajectory(ax, solution)
-        >>> iterator = trajectory()
-        >>> # Set the marker to show the next position of the solution
-        >>> for pos in iterator:
-        ...     print(pos)
+        >>> # Set the marker to show each position of the solution
+        >>> for i in range(len(trajectory)):
+        ...     trajectory.set_marker(trajectory.positions[i])
+        ...     print(trajectory.positions[i])
         [1. 1.]
         [0.904... 0.904...]
         [0.818... 0.818...]
@@ -167,8 +173,12 @@ class Trajectory(EqualAspectAxis):
         self.color = color
         add_state_space_arrows(self.ax)
 
+        # One (p, dotp) row per time point, stored contiguously
+        # so each animation frame reads a single cached row
+        self.positions = np.ascontiguousarray(self.solution.y.T)
+
         # Add the marker to the axis
-        self._marker = Circle(xy=self.solution.y[:, 0],
+        self._marker = Circle(xy=self.positions[0],
                               radius=radius,
                               facecolor=color,
                               zorder=zorder)
@@ -179,9 +189,13 @@ class Trajectory(EqualAspectAxis):
             n = y.shape[1]
         ax.plot(y[0, :n], y[1, :n], color=color, zorder=zorder, lw=0.5)
 
-    def __call__(self):
-        for y in self.solution.y.T:
-            yield y
+    def __len__(self):
+        return self.positions.shape[0]
+
+    @property
+    def artists(self):
+        """Artists that move when the marker is set."""
+        return [self._marker]
 
     def set_marker(self, position):
         self._marker.set_center(position)
@@ -1,7 +1,181 @@
-from typing import Any, Sequence
+import functools
+import math
+from typing import Any, NamedTuple, Optional, Sequence
 
 import numpy as np
-from scipy.integrate import solve_ivp
+
+
+class Solution(NamedTuple):
+    """Time series returned by the closed form solutions.
+
+    This has the same ``t`` and ``y`` fields as the solution
+    object returned by scipy.integrate.solve_ivp.
+    """
+    t: np.ndarray
+    y: np.ndarray
+
+
+# Integration methods (as named by solve_ivp) that make use of a Jacobian
+_IMPLICIT_METHODS = ('Radau', 'BDF', 'LSODA')
+
+
+def _sample_times(t: float, freq: float) -> np.ndarray:
+    """Times at which to evaluate a simulation.
+
+    These are exactly ``1/freq`` seconds apart, starting from 0. If
+    ``t`` is not a whole number of samples the last sample is the
+    one before ``t``. The same (t, freq) is usually simulated
+    repeatedly, so the last few arrays are cached. The result is
+    shared and read only, so it must be copied before being
+    returned to callers.
+
+    Examples:
+
+        >>> _sample_times(1.2, 2.0)
+        array([0. , 0.5, 1. ])
+        >>> # 8.2 * 15 is just under 123 in floating point
+        >>> _sample_times(8.2, 15.0).shape
+        (124,)
+    """
+    # Convert so that NumPy scalars (which are unhashable when 0-d
+    # arrays) share the cache with the equivalent floats
+    return _cached_sample_times(float(t), float(freq))
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_sample_times(t: float, freq: float) -> np.ndarray:
+    # Allow for rounding error in t * freq, so that a whole number
+    # of samples is not rounded down to one less
+    n = int(t * freq + 1e-9) + 1
+    t_eval = np.minimum(np.arange(n) / freq, t)
+    t_eval.setflags(write=False)
+    return t_eval
+
+
+@functools.lru_cache(maxsize=None)
+def _escapement_dtype(p_dtype: np.dtype, dotp_dtype: np.dtype):
+    """Working dtype for the escapement, and where its sinh overflows.
+
+    States are promoted to floating point (integers become float64,
+    while float32 grids stay float32). This is cached as finding
+    the type and its limits costs more than the rest of the
+    calculation on small arrays.
+    """
+    dtype = np.result_type(p_dtype, dotp_dtype, np.float32)
+    return dtype, math.log(np.finfo(dtype).max)
+
+
+def _damped_oscillator(ks: np.ndarray, inits: np.ndarray,
+                       t_eval: np.ndarray) -> np.ndarray:
+    """Closed form solution of the linear pendulum equation.
+
+    With $\\alpha = k/2$, the solution of $\\ddot{p} = -p - k\\dot{p}$ is
+
+    .. math::
+
+        p(t) = p_0 c(t) + (\\dot{p}_0 + \\alpha p_0) s(t)
+
+        \\dot{p}(t) = \\dot{p}_0 c(t) - (p_0 + \\alpha \\dot{p}_0) s(t)
+
+    where $c(t) = e^{-\\alpha t}\\cos(\\omega t)$,
+    $s(t) = e^{-\\alpha t}\\sin(\\omega t)/\\omega$ and
+    $\\omega = \\sqrt{1 - \\alpha^2}$. When the pendulum is overdamped
+    ($|\\alpha| > 1$) the cos and sin become cosh and sinh, which
+    are written in terms of the two decaying exponentials so that
+    they do not overflow.
+
+    This is evaluated for a batch of B pendulums at once, each
+    with its own drag coefficient and initial state.
+
+    Examples:
+
+        >>> # Critically damped, p(t) = t e^{-t}
+        >>> t = np.linspace(0.0, 5.0, 6)
+        >>> y = _damped_oscillator(np.array([2.0]), np.array([[0.0], [1.0]]),
+        ...                        t)
+        >>> np.allclose(y[0, 0], t * np.exp(-t))
+        True
+        >>> # Heavily overdamped, still finite
+        >>> y = _damped_oscillator(np.array([100.0]), np.array([[1.0], [0.0]]),
+        ...                        t * 100)
+        >>> bool(np.isfinite(y).all())
+        True
+
+    Arguments:
+
+        ks: Drag coefficients, shape (B,)
+        inits: Initial states ($p_0, \\dot{p}_0$), shape (2, B)
+        t_eval: Time points to evaluate at, shape (n_points,)
+
+    Returns:
+
+        Array of shape (B, 2, n_points) giving the state of each
+        pendulum at t_eval.
+    """
+
+    alpha = 0.5 * np.asarray(ks, dtype=float)[:, np.newaxis]
+    c = np.empty((alpha.shape[0], t_eval.shape[0]))
+    s = np.empty_like(c)
+
+    under = np.abs(alpha[:, 0]) <= 1
+    a = alpha[under]
+    omega = np.sqrt(1 - a**2)
+    decay = np.exp(-a * t_eval)
+    c[under] = decay * np.cos(omega * t_eval)
+    # sinc keeps s(t) finite (equal to t e^{-alpha t}) when
+    # the pendulum is critically damped and omega is zero
+    s[under] = decay * t_eval * np.sinc(omega * t_eval / np.pi)
+
+    a = alpha[~under]
+    gamma = np.sqrt(a**2 - 1)
+    slow = np.exp((gamma - a) * t_eval)
+    fast = np.exp(-(gamma + a) * t_eval)
+    c[~under] = 0.5 * (slow + fast)
+    s[~under] = -0.5 * slow * np.expm1(-2 * gamma * t_eval) / gamma
+
+    p0, dotp0 = np.asarray(inits, dtype=float)[:, :, np.newaxis]
+    y = np.empty((alpha.shape[0], 2, t_eval.shape[0]))
+    y[:, 0] = p0 * c + (dotp0 + alpha * p0) * s
+    y[:, 1] = dotp0 * c - (p0 + alpha * dotp0) * s
+    return y
+
+
+def _rk4(fun: Any, init: Sequence[float], t_eval: np.ndarray) -> np.ndarray:
+    """Integrate a pendulum model with the classical Runge-Kutta method.
+
+    One fixed step is taken between each pair of samples, so there is
+    no step size control or interpolation, and the error depends on the
+    sampling frequency. The state is kept as a pair of Python floats,
+    which is much cheaper than NumPy arrays for a two dimensional
+    system.
+
+    Arguments:
+
+        fun: Derivative of the state, as passed to solve_ivp
+        init: Initial state ($p_0, \\dot{p}_0$)
+        t_eval: Time points to evaluate at, shape (n_points,)
+
+    Returns:
+
+        Array of shape (2, n_points) giving the state at t_eval.
+    """
+
+    p, dotp = (float(x) for x in init)
+    ps = [p]
+    dotps = [dotp]
+    times = t_eval.tolist()
+    for t, t_next in zip(times[:-1], times[1:]):
+        h = t_next - t
+        half = 0.5 * h
+        k1p, k1v = fun(t, (p, dotp))
+        k2p, k2v = fun(t + half, (p + half * k1p, dotp + half * k1v))
+        k3p, k3v = fun(t + half, (p + half * k2p, dotp + half * k2v))
+        k4p, k4v = fun(t_next, (p + h * k3p, dotp + h * k3v))
+        p += h / 6 * (k1p + 2 * (k2p + k3p) + k4p)
+        dotp += h / 6 * (k1v + 2 * (k2v + k3v) + k4v)
+        ps.append(p)
+        dotps.append(dotp)
+    return np.array([ps, dotps])
 
 
 class Pendulum:
@@ -22,12 +196,26 @@ class Pendulum:
         >>> sol.y.shape
         (2, 501)
         >>> sol.y[:, :10]
-        array([[0.        , 0.01997868, 0.03990946, 0.05978448, 0.07959589,
-                0.09933591, 0.11899699, 0.13857267, 0.15805515, 0.17743645],
+        array([[0.        , 0.01997868, 0.03990946, 0.05978447, 0.07959589,
+                0.09933591, 0.1189968 , 0.13857086, 0.15805043, 0.17742794],
                [1.        , 0.99780227, 0.99521023, 0.99222569, 0.98885063,
-                0.98508718, 0.98093764, 0.97640454, 0.9714905 , 0.9661983 ]])
+                0.98508718, 0.98093763, 0.97640439, 0.97149006, 0.96619735]])
+        >>> # Integrate with fixed steps instead
+        >>> fixed = pendulum.solve(init=[0., 1.], t=10.0, freq=50.0,
+        ...                        fixed_step=True)
+        >>> np.allclose(fixed.y, sol.y, atol=1e-6)
+        True
     """
 
+    # The pendulum equation is linear, so solve() can use
+    # the closed form solution instead of calling into scipy
+    linear = True
+
+    # Default integration method for nonlinear subclasses that do
+    # not set their own. Pendulum itself is solved exactly unless a
+    # method is given, so this is never used for it.
+    method = 'RK45'
+
     def __init__(self, k: float):
         self.k = k
 
@@ -50,41 +238,382 @@ class Pendulum:
 
         Returns:
 
-            Array giving the derivative ($\\dot{p}, \\ddot{p}$)
+            Tuple giving the derivative ($\\dot{p}, \\ddot{p}$)
+        """
+
+        dotp = y[1]
+        return (dotp, self._acceleration(y[0], dotp, self.k))
+
+    def _acceleration(self, p, dotp, k):
+        """Acceleration $\\ddot{p}$ for drag coefficient ``k``.
+
+        ``p``, ``dotp`` and ``k`` may be arrays, so that this can be
+        evaluated for an ensemble of pendulums at once.
         """
 
-        p, dotp = y
-        ddotp = -p - self.k * dotp
+        return -p - k * dotp
+
+    def _rhs(self):
+        """Derivative for the ODE solvers.
+
+        This is equivalent to calling the model, but binds the drag
+        coefficient and the :meth:`_acceleration` method into a
+        closure, as the solver calls it for every stage of every
+        step. It indexes rather than unpacks the state and returns
+        a tuple rather than building a list for the same reason.
+
+        Examples:
+
+            >>> model = PendulumWithEscapement(0.1, 0.25)
+            >>> rhs = model._rhs()
+            >>> states = np.random.default_rng(0).uniform(-1, 1, (10, 2))
+            >>> all(rhs(0.0, y) == model(0.0, y) for y in states)
+            True
+            >>> # The same as evaluating all the states as arrays
+            >>> ddotp = model._acceleration(states[:, 0], states[:, 1], 0.1)
+            >>> np.allclose([rhs(0.0, y)[1] for y in states], ddotp)
+            True
+        """
+
+        k = self.k
+        acceleration = self._acceleration
+
+        def rhs(t, y):
+            dotp = y[1]
+            return (dotp, acceleration(y[0], dotp, k))
+
+        return rhs
 
-        return [dotp, ddotp]
+    def jac(self, t: float, y: Sequence[float]) -> np.ndarray:
+        """Jacobian of the derivative with respect to the state.
+
+        Supplying this to the solver saves it from estimating
+        the Jacobian by finite differences.
+
+        Arguments:
+
+            t: The time being solved for (this is not used here)
+            y: The input state (an array of $p, \\dot{p}$)
+
+        Returns:
+
+            2x2 array of partial derivatives of ($\\dot{p}, \\ddot{p}$)
+            with respect to ($p, \\dot{p}$)
+        """
+
+        ddotp_dp, ddotp_ddotp = self._partials(y[0], y[1], self.k)
+        return np.array([[0.0, 1.0], [ddotp_dp, ddotp_ddotp]])
+
+    def _partials(self, p, dotp, k):
+        """Partial derivatives of $\\ddot{p}$ with respect to $p, \\dot{p}$.
+
+        As for :meth:`_acceleration`, the arguments may be arrays, so
+        that this can fill in the Jacobian of an ensemble as well as
+        of one system.
+        """
+
+        return -1.0, -k
 
     def solve(self,
               init: Sequence[float],
               t: float = 1.0,
-              freq: float = 50.0) -> Any:
+              freq: float = 50.0,
+              method: Optional[str] = None,
+              rtol: float = 1e-3,
+              atol: float = 1e-6,
+              transpose: bool = False,
+              fixed_step: bool = False) -> Any:
         """Evaluate a time series simulation of the pendulum.
 
+        Examples:
+
+            >>> pendulum = Pendulum(0.1)
+            >>> exact = pendulum.solve([0., 1.], t=10.0, freq=50.0)
+            >>> # Integrate numerically instead of using the closed form
+            >>> sol = pendulum.solve([0., 1.], t=10.0, freq=50.0,
+            ...                      method='Radau', rtol=1e-8, atol=1e-10)
+            >>> np.allclose(sol.y, exact.y, atol=1e-6)
+            True
+            >>> # One row per time point
+            >>> sol = pendulum.solve([0., 1.], t=10.0, freq=50.0,
+            ...                      transpose=True)
+            >>> sol.y.shape
+            (501, 2)
+            >>> sol.y.flags['C_CONTIGUOUS']
+            True
+            >>> np.array_equal(sol.y, exact.y.T)
+            True
+
         Arguments:
 
             init: Initial state of the pendulum
             t: Number of seconds to simulate for
             freq: Sampling frequency - evaluate this many
                 times per second.
+            method: Integration method, as accepted by
+                scipy.integrate.solve_ivp. By default the linear
+                pendulum is solved exactly, and other models are
+                integrated with their ``method`` attribute. Giving
+                a method always integrates numerically. The analytic
+                :meth:`jac` is passed to the implicit methods
+                ('Radau', 'BDF' and 'LSODA').
+            rtol: Relative tolerance of the integration
+            atol: Absolute tolerance of the integration
+            transpose: Return ``y`` with one (contiguous) row
+                per time point, for callers that process the
+                solution a time point at a time.
+            fixed_step: Integrate with the classical 4th order
+                Runge-Kutta method, taking one step per sample
+                (so ``method``, ``rtol`` and ``atol`` are ignored).
+                This is faster than the adaptive methods, but is
+                only accurate when ``freq`` is high compared to
+                the dynamics of the model.
 
         Returns:
 
-            A solution object as per scipy.integrate.solve_ivp.
+            A solution object as per scipy.integrate.solve_ivp
+            (or a :class:`Solution` with the same fields for the
+            linear pendulum, which is solved exactly, or when
+            ``fixed_step`` is given).
             In particular, we have the following fields:
 
             t (ndarray, shape (n_points,)):
                 Time points.
 
             y (ndarray, shape (n, n_points)):
-                Values of the solution at t.
+                Values of the solution at t (shape (n_points, n)
+                if ``transpose`` is given).
+        """
+
+        t_eval = _sample_times(t, freq)
+        if fixed_step:
+            sol = Solution(t_eval.copy(), _rk4(self._rhs(), init, t_eval))
+        elif method is None and self.linear:
+            y = _damped_oscillator(np.array([self.k]),
+                                   np.reshape(init, (2, 1)), t_eval)
+            sol = Solution(t_eval.copy(), y[0])
+        else:
+            # scipy.integrate is slow to import and is not needed
+            # for the closed form or fixed step solutions
+            from scipy.integrate import solve_ivp
+
+            method = method or self.method
+            options = dict(method=method, rtol=rtol, atol=atol)
+            if method in _IMPLICIT_METHODS:
+                options['jac'] = self.jac
+            sol = solve_ivp(self._rhs(), [0.0, t],
+                            init,
+                            t_eval=t_eval,
+                            **options)
+
+        if transpose:
+            y = np.ascontiguousarray(sol.y.T)
+            if isinstance(sol, Solution):
+                return sol._replace(y=y)
+            # Keep the status fields (success, message, ...) of the
+            # solve_ivp result
+            sol.y = y
+        return sol
+
+    @classmethod
+    def solve_batch(cls,
+                    inits: np.ndarray,
+                    ks: np.ndarray,
+                    t: float = 1.0,
+                    freq: float = 50.0,
+                    method: Optional[str] = None,
+                    rtol: float = 1e-3,
+                    atol: float = 1e-6,
+                    **params: float) -> Solution:
+        """Simulate a batch of pendulums together.
+
+        Each pendulum has its own drag coefficient and initial
+        state, and they are all sampled at the same times. This
+        is much faster than calling :meth:`solve` for each one
+        when sweeping over parameters.
+
+        By default the linear pendulum is solved exactly. Other
+        models, or any model when ``method`` is given, are integrated
+        numerically as one ensemble (see :meth:`solve_ensemble`).
+
+        Examples:
+
+            >>> sol = Pendulum.solve_batch(inits=[[0., 1.], [0.5, 0.]],
+            ...                            ks=[0.1, 0.5], t=10.0, freq=50.0)
+            >>> sol.y.shape
+            (2, 2, 501)
+            >>> single = Pendulum(0.5).solve([0.5, 0.], t=10.0, freq=50.0)
+            >>> np.allclose(sol.y[1], single.y)
+            True
+            >>> sol = PendulumWithEscapement.solve_batch(
+            ...     inits=[[0.4, 0.], [0.4, 0.]], ks=[0.1, 0.5],
+            ...     t=10.0, freq=50.0, rtol=1e-8, atol=1e-10, q=0.25)
+            >>> sol.y.shape
+            (2, 2, 501)
+            >>> single = PendulumWithEscapement(0.5, 0.25).solve(
+            ...     [0.4, 0.], t=10.0, freq=50.0, rtol=1e-8, atol=1e-10)
+            >>> np.allclose(sol.y[1], single.y, atol=1e-6)
+            True
+
+        Arguments:
+
+            inits: Initial states, shape (B, 2)
+            ks: Drag coefficients, shape (B,)
+            t: Number of seconds to simulate for
+            freq: Sampling frequency - evaluate this many
+                times per second.
+            method: Integration method, as for :meth:`solve`
+            rtol: Relative tolerance of the integration
+            atol: Absolute tolerance of the integration
+            params: Any other parameters of the model (such as
+                ``q`` for :class:`PendulumWithEscapement`), which
+                are shared by the whole batch.
+
+        Returns:
+
+            A :class:`Solution` where ``t`` has shape (n_points,)
+            and ``y`` has shape (B, 2, n_points), so that ``y[b]``
+            is the (contiguous) trajectory of pendulum ``b``.
+
+        Raises:
+
+            RuntimeError: If a numerical integration fails
+        """
+
+        # Each pendulum's drag is taken from ks, so the model's own
+        # drag coefficient is not used
+        model = cls(0.0, **params)
+        if method is not None or not model.linear:
+            return model.solve_ensemble(inits, t, freq, method, rtol, atol,
+                                        ks=ks)
+
+        t_eval = _sample_times(t, freq)
+        inits = np.asarray(inits, dtype=float).T
+        return Solution(t_eval.copy(), _damped_oscillator(ks, inits, t_eval))
+
+    def solve_ensemble(self,
+                       inits: np.ndarray,
+                       t: float = 1.0,
+                       freq: float = 50.0,
+                       method: Optional[str] = None,
+                       rtol: float = 1e-3,
+                       atol: float = 1e-6,
+                       ks: Optional[np.ndarray] = None) -> Solution:
+        """Simulate several copies of the pendulum together.
+
+        Each copy has its own initial state and, optionally, its own
+        drag coefficient. The M copies of the system are concatenated
+        into a single 2M dimensional system, so that the solver is
+        only set up and called once for all of them, rather than once
+        each. The step size is shared between all the copies, so this
+        works best when they have similar dynamics.
+
+        Examples:
+
+            >>> pendulum = PendulumWithEscapement(0.1, 0.25)
+            >>> sol = pendulum.solve_ensemble([[0.4, 0.], [0.8, 0.]],
+            ...                               t=10.0, freq=50.0)
+            >>> sol.y.shape
+            (2, 2, 501)
+            >>> # Sweep the drag coefficient
+            >>> sol = pendulum.solve_ensemble([[0.4, 0.], [0.4, 0.]],
+            ...                               t=10.0, freq=50.0,
+            ...                               rtol=1e-8, atol=1e-10,
+            ...                               ks=[0.1, 0.5])
+            >>> single = PendulumWithEscapement(0.5, 0.25).solve(
+            ...     [0.4, 0.], t=10.0, freq=50.0, rtol=1e-8, atol=1e-10)
+            >>> np.allclose(sol.y[1], single.y, atol=1e-6)
+            True
+
+        Arguments:
+
+            inits: Initial states, shape (M, 2)
+            t: Number of seconds to simulate for
+            freq: Sampling frequency - evaluate this many
+                times per second.
+            method: Integration method, as for :meth:`solve`
+            rtol: Relative tolerance of the integration
+            atol: Absolute tolerance of the integration
+            ks: Drag coefficients, shape (M,). By default every
+                copy uses the drag coefficient of this model.
+
+        Returns:
+
+            A :class:`Solution` where ``t`` has shape (n_points,)
+            and ``y`` has shape (M, 2, n_points), so that ``y[m]``
+            is the (contiguous) trajectory starting from ``inits[m]``.
+
+        Raises:
+
+            RuntimeError: If the integration fails (the message is
+                the one given by scipy.integrate.solve_ivp)
+        """
+
+        inits = np.asarray(inits, dtype=float)
+        m = inits.shape[0]
+        if ks is None:
+            ks = np.full(m, self.k)
+        else:
+            ks = np.asarray(ks, dtype=float)
+        if method is None and self.linear:
+            return self.solve_batch(inits, ks, t, freq)
+
+        from scipy.integrate import solve_ivp
+
+        ensemble, ensemble_jac = self._ensemble(ks)
+        method = method or self.method
+        options = dict(method=method, rtol=rtol, atol=atol)
+        if method in _IMPLICIT_METHODS:
+            options['jac'] = ensemble_jac
+
+        t_eval = _sample_times(t, freq)
+        sol = solve_ivp(ensemble, [0.0, t],
+                        inits.T.ravel(),
+                        t_eval=t_eval,
+                        **options)
+        if not sol.success:
+            # The trajectories would stop short at the point where
+            # the solver gave up
+            raise RuntimeError(sol.message)
+        y = sol.y.reshape(2, m, -1).transpose(1, 0, 2)
+        return Solution(sol.t, np.ascontiguousarray(y))
+
+    def _ensemble(self, ks: np.ndarray):
+        """Derivative and Jacobian of an ensemble of M pendulums.
+
+        The state of the ensemble is all the positions followed by all
+        the velocities, so each half is a contiguous array that
+        :meth:`_acceleration` can be evaluated on directly.
+
+        Arguments:
+
+            ks: Drag coefficients of the pendulums, shape (M,)
+
+        Returns:
+
+            Functions ``(fun, jac)`` of ``(t, y)``, as passed to
+            scipy.integrate.solve_ivp, for the 2M dimensional system.
         """
 
-        t_eval = np.linspace(0.0, t, int(np.floor(t*freq+1)))
-        return solve_ivp(self, [0.0, t], init, t_eval=t_eval)
+        m = ks.shape[0]
+        diag = np.arange(m)
+
+        def ensemble(t, y):
+            p, dotp = y.reshape(2, m)
+            return np.concatenate((dotp, self._acceleration(p, dotp, ks)))
+
+        def ensemble_jac(t, y):
+            # The copies are independent, so the Jacobian is made
+            # up of four diagonal blocks
+            p, dotp = y.reshape(2, m)
+            ddotp_dp, ddotp_ddotp = self._partials(p, dotp, ks)
+            jac = np.zeros((2 * m, 2 * m))
+            jac[diag, m + diag] = 1.0
+            jac[m + diag, diag] = ddotp_dp
+            jac[m + diag, m + diag] = ddotp_ddotp
+            return jac
+
+        return ensemble, ensemble_jac
 
 
 class PendulumWithEscapement(Pendulum):
@@ -95,30 +624,102 @@ class PendulumWithEscapement(Pendulum):
     indefinitely (like a clock) even when there is drag.
     """
 
+    linear = False
+
+    # The escapement is only felt in a narrow band of each swing,
+    # where the dynamics are stiff. LSODA switches to a stiff
+    # method there and back again for the rest of the swing.
+    method = 'LSODA'
+
     def __init__(self, k: float, q: float):
         super().__init__(k)
         self.q = q
 
-    def __call__(self, t: float, y: Sequence[float]):
-        """Calculate derivative.
+    def _acceleration(self, p, dotp, k):
+        """Acceleration $\\ddot{p}$ for drag coefficient ``k``.
 
-        The pendulum component of the derivative is unchanged.
-        We add an acceleration introduced by the escapement.
+        The escapement force (scaled by ``q``) is added to the
+        acceleration of the pendulum.
         """
 
-        # This calls the base class to get the acceleration
-        # due to the pendulum
-        ddotp_pendulum = super().__call__(t, y)[1]
+        return -p - k * dotp + self.q * self.escapement(p, dotp)
 
-        # This calculates the additional acceleration provided
-        # by the escapement
-        ddotp_escapement = self.q * self.escapement(*y)
+    def _partials(self, p, dotp, k):
+        """Partial derivatives of $\\ddot{p}$ with respect to $p, \\dot{p}$.
 
-        ddotp = ddotp_pendulum + ddotp_escapement
-        return [y[1], ddotp]
+        The escapement adds its gradient (scaled by ``q``) to
+        those of the pendulum.
+        """
+
+        plus = np.exp(-20 * ((p + 0.4)**2 + (dotp - 0.4)**2))
+        minus = np.exp(-20 * ((p - 0.4)**2 + (dotp + 0.4)**2))
+        de_dp = -40 * ((p + 0.4) * plus - (p - 0.4) * minus)
+        de_ddotp = -40 * ((dotp - 0.4) * plus - (dotp + 0.4) * minus)
+        return -1.0 + self.q * de_dp, -k + self.q * de_ddotp
+
+    @staticmethod
+    def escapement(p, dotp):
+        """Calculate the escapement force.
+
+        This is the difference of two Gaussian peaks,
+        ``exp(-20*d1) - exp(-20*d2)``, centred on (-0.4, 0.4) and
+        (0.4, -0.4). The peaks share a common factor, so they are
+        evaluated together as
+
+        .. math::
+
+            -2 e^{-20(p^2 + \\dot{p}^2 + 0.32)} \\sinh(16(p - \\dot{p}))
+
+        which needs one exp and one sinh instead of two exps. Scalar
+        states (as passed by the ODE solver) go through the math module,
+        which avoids the overhead of NumPy ufuncs on single values. For
+        arrays (e.g. a meshgrid of the state space) the result is
+        computed in place to avoid allocating temporaries.
+
+        The sinh term only overflows far from the origin, where the
+        exp term has already underflowed to zero, so those states give
+        zero force rather than ``0 * inf``.
+
+        The force does not depend on ``k`` or ``q``, so this can be
+        called on the class as well as on an instance.
+
+        Examples:
+
+            >>> PendulumWithEscapement.escapement(np.array([0, 1]),
+            ...                                   np.array([0, 0]))
+            array([-0.0000000e+00, -3.0432483e-05])
+            >>> # Far from the origin the force vanishes
+            >>> PendulumWithEscapement.escapement(np.array([50.]),
+            ...                                   np.array([-50.]))
+            array([-0.])
+            >>> PendulumWithEscapement.escapement(np.float32([10.]),
+            ...                                   np.float32([-10.]))
+            array([-0.], dtype=float32)
+        """
 
-    def escapement(self, p, dotp):
-        def peak(offset):
-            d = (-p-offset)**2+(dotp-offset)**2
-            return np.exp(-20*d)
-        return peak(0.4) - peak(-0.4)
+        # The ODE solvers pass floats, so check for those before
+        # falling back on the slower check for other scalars
+        if (isinstance(p, float) and isinstance(dotp, float)
+                or np.ndim(p) == 0 and np.ndim(dotp) == 0):
+            e = math.exp(-20 * (p * p + dotp * dotp + 0.32))
+            if e == 0.0:
+                return 0.0
+            return -2 * e * math.sinh(16 * (p - dotp))
+
+        p = np.asarray(p)
+        dotp = np.asarray(dotp)
+        dtype, limit = _escapement_dtype(p.dtype, dotp.dtype)
+        e = np.square(p, dtype=dtype)
+        e += np.square(dotp, dtype=dtype)
+        e += 0.32
+        e *= -20
+        np.exp(e, out=e)
+        s = np.subtract(p, dotp, dtype=dtype)
+        s *= 16
+        # Stop sinh overflowing (at about 89 in float32 and 710 in
+        # float64). Beyond this the exp term is zero anyway.
+        np.clip(s, -limit, limit, out=s)
+        np.sinh(s, out=s)
+        e *= s
+        e *= -2
+        return e
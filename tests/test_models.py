@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from clock.models import Pendulum, PendulumWithEscapement
+
+MODELS = [Pendulum(0.3), PendulumWithEscapement(0.1, 0.25)]
+
+
+def finite_difference_jac(fun, y, h=1e-6):
+    """Jacobian of fun(0, y) by central differences."""
+    columns = []
+    for dy in np.eye(len(y)) * h:
+        columns.append((np.asarray(fun(0.0, y + dy)) -
+                        np.asarray(fun(0.0, y - dy))) / (2 * h))
+    return np.column_stack(columns)
+
+
+@pytest.mark.parametrize('model', MODELS)
+def test_jac(model):
+    states = np.random.default_rng(0).uniform(-1, 1, (20, 2))
+    for y in states:
+        np.testing.assert_allclose(model.jac(0.0, y),
+                                   finite_difference_jac(model, y),
+                                   atol=1e-8)
+
+
+@pytest.mark.parametrize('model', MODELS)
+def test_ensemble_jac(model):
+    ks = np.array([0.1, 0.5, 2.0])
+    fun, jac = model._ensemble(ks)
+    y = np.random.default_rng(1).uniform(-1, 1, 2 * len(ks))
+    np.testing.assert_allclose(jac(0.0, y),
+                               finite_difference_jac(fun, y),
+                               atol=1e-8)
+
+
+@pytest.mark.filterwarnings('ignore')
+def test_ensemble_failure_raises():
+    # The solver cannot keep up with the growth of a negative drag
+    model = PendulumWithEscapement(0.1, 0.25)
+    with pytest.raises(RuntimeError):
+        model.solve_ensemble([[0.4, 0.]], t=1.0, freq=10.0, ks=[-2000.])
+
+
+@pytest.mark.filterwarnings('ignore')
+def test_transpose_keeps_status():
+    model = PendulumWithEscapement(-2000., 0.25)
+    sol = model.solve([0.4, 0.], t=1.0, freq=10.0, transpose=True)
+    assert not sol.success
+    assert sol.y.shape[1] == 2
+    assert sol.y.flags['C_CONTIGUOUS']
+
+
+def test_sample_times_not_shared():
+    # 0-d arrays are accepted, and callers get their own (writable)
+    # copy of the sample times on every path
+    pendulum = Pendulum(0.1)
+    for sol in [pendulum.solve([0., 1.], np.array(2.0), 10),
+                pendulum.solve([0., 1.], 2.0, 10, fixed_step=True),
+                Pendulum.solve_batch([[0., 1.]], [0.1], 2.0, 10)]:
+        assert sol.t.shape == (21,)
+        sol.t[:] = 0.0
+    assert pendulum.solve([0., 1.], 2.0, 10).t[-1] == 2.0